@@ -1,4 +1,12 @@
+import functools as _functools
+import hashlib as _hashlib
+import os as _os
+import pickle as _pickle
+from importlib import metadata as _metadata
+from pathlib import Path as _Path
+
 import pkgdata as _pkgdata
+import pyserials as _ps
 
 
 _data_dir_path = _pkgdata.get_package_path_from_caller(top_level=True) / "_data"
@@ -13,6 +21,80 @@ def get_package_datafile(path: str) -> str | dict | list:
     path : str
         The path of the data file relative to the package's '_data' directory.
     """
-    full_path = _data_dir_path / path
-    data = full_path.read_text()
+    return _read(path)
+
+
+def get_package_datafile_yaml(path: str) -> dict | list | str | int | float | bool:
+    """
+    Get the parsed content of a YAML data file in the package's '_data' directory.
+
+    Parameters
+    ----------
+    path : str
+        The path of the data file relative to the package's '_data' directory.
+
+    Returns
+    -------
+    The parsed content. Each call returns a new object,
+    which can be freely modified by the caller.
+
+    Notes
+    -----
+    Parsed content is kept in an on-disk pickle cache across processes when available.
+    The cache file is named after a hash of the file's content, in a directory
+    specific to the installed versions of this package and its YAML parsers,
+    so that outdated entries are never used. Entries that cannot be loaded
+    (e.g. corrupt files) are removed and the file is parsed again.
+    """
+    filepath = _data_dir_path / path
+    cache_dir = _pickle_cache_dir()
+    if cache_dir is None:
+        return _ps.read.yaml_from_file(path=filepath)
+    cache_path = cache_dir / f"{_hashlib.blake2b(filepath.read_bytes(), digest_size=8).hexdigest()}.pkl"
+    try:
+        return _pickle.loads(cache_path.read_bytes())
+    except FileNotFoundError:
+        pass
+    except Exception:
+        # Unpickling can fail in many ways, e.g. for truncated files
+        # or objects of classes that no longer exist.
+        _remove_file(cache_path)
+    data = _ps.read.yaml_from_file(path=filepath)
+    temp_path = cache_path.with_suffix(f".{_os.getpid()}.tmp")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path.write_bytes(_pickle.dumps(data, protocol=5))
+        _os.replace(temp_path, cache_path)
+    except Exception:
+        _remove_file(temp_path)
     return data
+
+
+@_functools.lru_cache(maxsize=None)
+def _read(path: str) -> str:
+    return (_data_dir_path / path).read_text(encoding="utf-8")
+
+
+@_functools.lru_cache(maxsize=None)
+def _pickle_cache_dir() -> _Path | None:
+    try:
+        versions = [_metadata.version(dist) for dist in ("DocsMan", "PySerials", "ruamel.yaml")]
+    except _metadata.PackageNotFoundError:
+        return None
+    cache_home = _os.environ.get("XDG_CACHE_HOME", "")
+    if not _os.path.isabs(cache_home):
+        # Relative paths are ignored, as per the XDG Base Directory Specification.
+        # Unlike `Path.home`, `expanduser` does not raise when the home directory is unknown,
+        # but returns the path unchanged.
+        cache_home = _os.path.expanduser("~/.cache")
+        if not _os.path.isabs(cache_home):
+            return None
+    return _Path(cache_home) / "docsman" / "_".join(versions)
+
+
+def _remove_file(path: _Path) -> None:
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass
+    return
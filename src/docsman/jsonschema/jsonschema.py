@@ -1,29 +1,148 @@
-from typing import Literal as _Literal
+from typing import Any as _Any, Iterator as _Iterator, Literal as _Literal
+import functools as _functools
 
 import pyserials as _ps
 import markitup as _miu
+from ruamel.yaml import scalarstring as _yaml_scalar_string
 
 from controlman.file_gen.docs import markdown as _md
 
 INLINE_MAX_LINE_LENGTH = 50
 
+_TRIGGER_SET = frozenset(
+    {
+        "properties",
+        "additionalProperties",
+        "items", "not", "if", "then", "else",
+        "anyOf", "oneOf", "allOf",
+    }
+)
+
+_REF_BIT = 1 << 0
+_ANY_OF_BIT = 1 << 1
+_ONE_OF_BIT = 1 << 2
+_ALL_OF_BIT = 1 << 3
+_NOT_BIT = 1 << 4
+_IF_BIT = 1 << 5
+_ADD_PROPS_BIT = 1 << 6
+_TYPE_BIT = 1 << 7
+_PROPERTIES_BIT = 1 << 8
+_ITEMS_BIT = 1 << 9
+_THEN_BIT = 1 << 10
+_ELSE_BIT = 1 << 11
+_SHAPE_BITS = (
+    ("$ref", _REF_BIT),
+    ("anyOf", _ANY_OF_BIT),
+    ("oneOf", _ONE_OF_BIT),
+    ("allOf", _ALL_OF_BIT),
+    ("not", _NOT_BIT),
+    ("if", _IF_BIT),
+    ("additionalProperties", _ADD_PROPS_BIT),
+    ("type", _TYPE_BIT),
+    ("properties", _PROPERTIES_BIT),
+    ("items", _ITEMS_BIT),
+    ("then", _THEN_BIT),
+    ("else", _ELSE_BIT),
+)
+_COMPLEX_MASK = _ANY_OF_BIT | _ONE_OF_BIT | _ALL_OF_BIT | _NOT_BIT | _IF_BIT
+_REF_COMPLEX_MASK = _COMPLEX_MASK | _REF_BIT
+_NESTED_MASK = _PROPERTIES_BIT | _ADD_PROPS_BIT | _ITEMS_BIT | _THEN_BIT | _ELSE_BIT
+_TRIGGER_MASK = _COMPLEX_MASK | _NESTED_MASK
+_CLEAN_BLACKLIST = frozenset({"title", "description", "examples", "root_key", "default_auto", "default"})
+
+# Pre-rendered inline code for frequent scalar values;
+# booleans and integers are kept apart since e.g. `True == 1`.
+_BOOL_MD = {True: "`true`", False: "`false`"}
+_SMALL_INT_MD = {i: f"`{i}`" for i in range(33)}
+_TYPE_MD = {
+    dtype: f"`{dtype}`"
+    for dtype in ("string", "number", "integer", "boolean", "object", "array", "null")
+}
+
+_FREEZABLE_SCALAR_TYPES = frozenset(
+    {str, int, float, bool, type(None), _yaml_scalar_string.LiteralScalarString}
+)
+
+
+def clear_caches() -> None:
+    """Clear the caches of rendered values, e.g. before generating docs for a new schema."""
+    _slug.cache_clear()
+    ref_name.cache_clear()
+    _ref_link.cache_clear()
+    _frozen_to_yaml_string.cache_clear()
+    return
+
+
+def shape_mask(schema: dict) -> int:
+    """Get a bitmask of the keys in a schema that determine how it is rendered and nested.
+
+    The mask can be computed once per schema and passed to the renderers
+    that accept a `mask` argument, so that they don't each probe the schema again.
+    """
+    mask = 0
+    for key, bit in _SHAPE_BITS:
+        if key in schema:
+            mask |= bit
+    return mask
+
 
 def get_subschemas(
     schema: dict,
     key: _Literal["properties", "additionalProperties", "items", "not", "if", "then", "else", "anyOf", "oneOf", "allOf"]
 ) -> tuple[list[str], list[dict]]:
-    if key == "properties":
-        return schema[key].keys(), schema[key].values()
-    if key == "additionalProperties":
-        return (["*"], [schema[key]]) if isinstance(schema[key], dict) else ([], [])
-    if key == "items":
-        return ["[i]"], [schema[key]]
-    if key in ["not", "if", "then", "else"]:
-        return [key], [schema[key]]
+    return _SUBSCHEMAS_GETTER[key](schema, key)
+
+
+def _subschemas_properties(schema: dict, key: str) -> tuple[list[str], list[dict]]:
+    return schema[key].keys(), schema[key].values()
+
+
+def _subschemas_additional_properties(schema: dict, key: str) -> tuple[list[str], list[dict]]:
+    return (["*"], [schema[key]]) if isinstance(schema[key], dict) else ([], [])
+
+
+def _subschemas_items(schema: dict, key: str) -> tuple[list[str], list[dict]]:
+    return ["[i]"], [schema[key]]
+
+
+def _subschemas_single(schema: dict, key: str) -> tuple[list[str], list[dict]]:
+    return [key], [schema[key]]
+
+
+def _subschemas_list(schema: dict, key: str) -> tuple[list[str], list[dict]]:
     return [f"{key}[{i}]" for i in range(1, len(schema[key])+1)], schema[key]
 
 
-def needs_separate_section(schema: dict, max_nesting: int = 2, _rec: int = 0) -> bool:
+_SUBSCHEMAS_GETTER = {
+    "properties": _subschemas_properties,
+    "additionalProperties": _subschemas_additional_properties,
+    "items": _subschemas_items,
+    "not": _subschemas_single,
+    "if": _subschemas_single,
+    "then": _subschemas_single,
+    "else": _subschemas_single,
+    "anyOf": _subschemas_list,
+    "oneOf": _subschemas_list,
+    "allOf": _subschemas_list,
+}
+
+
+def _subschema_values(
+    schema: dict,
+    key: _Literal["properties", "additionalProperties", "items", "not", "if", "then", "else", "anyOf", "oneOf", "allOf"]
+) -> _Iterator[dict]:
+    """Iterate over the sub-schemas under a key, like `get_subschemas` but without the labels."""
+    value = schema[key]
+    if key == "properties":
+        yield from value.values()
+    elif key in ("anyOf", "oneOf", "allOf"):
+        yield from value
+    elif key != "additionalProperties" or isinstance(value, dict):
+        yield value
+    return
+
+
+def needs_separate_section(schema: dict, max_nesting: int = 2) -> bool:
     """Check if a schema needs a separate section in the same file.
 
     A schema needs a separate section if it has more than two
@@ -31,24 +150,92 @@ def needs_separate_section(schema: dict, max_nesting: int = 2, _rec: int = 0) ->
     any of the following keys: `anyOf`, `oneOf`, `allOf`, `not`, `if`.
     A schema that uses `$ref` is not considered nested,
     because the reference must be documented in another file.
+
+    The schema is walked iteratively, stopping at the first sub-schema that exceeds
+    the nesting limit; each sub-schema is visited at most once per nesting level.
     """
-    if "$ref" in schema:
-        return False
-    for key in [
-        "properties",
-        "additionalProperties",
-        "items", "not", "if", "then", "else",
-        "anyOf", "oneOf", "allOf",
-    ]:
-        if key in schema:
-            if _rec >= max_nesting:
-                return True
-            for subschema in get_subschemas(schema, key)[1]:
-                if needs_separate_section(subschema, max_nesting=max_nesting, _rec=_rec+1):
-                    return True
+    visited: set[tuple[int, int]] = set()
+    stack: list[tuple[dict, int]] = [(schema, 0)]
+    while stack:
+        node, rec = stack.pop()
+        if not isinstance(node, dict):
+            # e.g. array-form `items`, or boolean schemas
+            continue
+        visit_key = (id(node), min(rec, max_nesting))
+        if visit_key in visited:
+            continue
+        visited.add(visit_key)
+        if "$ref" in node:
+            continue
+        present = _TRIGGER_SET.intersection(node)
+        if not present:
+            continue
+        if rec >= max_nesting:
+            return True
+        for key in present:
+            stack.extend((subschema, rec + 1) for subschema in _subschema_values(node, key))
     return False
 
 
+class SchemaIndex:
+    """Index of the nesting heights of a schema and all its (distinct) sub-schemas.
+
+    The index is built with a single iterative walk in depth-first post-order,
+    so that the height of each sub-schema is computed from those of its own sub-schemas.
+    The height is the number of consecutive nesting levels that count towards
+    `needs_separate_section`; a schema needs a separate section exactly when its height
+    exceeds `max_nesting`, so repeated checks during a documentation build
+    can be answered without walking the schema again.
+    """
+
+    def __init__(self, schema: dict):
+        # Map from the id of each sub-schema to the sub-schema itself and its height;
+        # keeping the sub-schema ensures that its id is not reused by another object.
+        self._heights: dict[int, tuple[dict, int]] = {}
+        seen: set[int] = set()
+        # Each entry holds a node, and whether its sub-schemas have already been added to the stack.
+        stack: list[tuple[dict, bool]] = [(schema, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                self._heights[id(node)] = (node, self._height(node))
+                continue
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            stack.append((node, True))
+            for key in _TRIGGER_SET.intersection(node):
+                for subschema in _subschema_values(node, key):
+                    if isinstance(subschema, dict):
+                        stack.append((subschema, False))
+        return
+
+    def needs_separate_section(self, schema: dict, max_nesting: int = 2) -> bool:
+        """Check if a schema needs a separate section; see `needs_separate_section`.
+
+        Schemas that are not in the index (e.g. non-dict sub-schemas,
+        or schemas created after the index was built) are checked directly.
+        """
+        entry = self._heights.get(id(schema))
+        if entry is None:
+            return needs_separate_section(schema, max_nesting)
+        return entry[1] > max_nesting
+
+    def _height(self, node: dict) -> int:
+        shape = shape_mask(node)
+        if shape & _REF_BIT or not shape & _TRIGGER_MASK:
+            return 0
+        return 1 + max(
+            (
+                self._heights[id(subschema)][1]
+                for key in _TRIGGER_SET.intersection(node)
+                for subschema in _subschema_values(node, key)
+                if isinstance(subschema, dict)
+            ),
+            default=0,
+        )
+
+
 def subschema_is_required(schema: dict, key: str, sub_key: str = "") -> bool:
     if key == "properties":
         return sub_key in schema.get("required", [])
@@ -61,30 +248,70 @@ def array_items_are_required(schema: dict) -> bool:
     return "minItems" in schema and schema["minItems"] > 0
 
 
-def clean_schema(schema: dict | list, is_prop_dict: bool = False) -> dict:
-    if isinstance(schema, dict):
-        clean = {}
-        for key, val in schema.items():
-            if key in ["title", "description", "examples", "root_key", "default_auto", "default"] and not is_prop_dict:
+def clean_schema(schema: dict | list, is_prop_dict: bool = False, multiline_to_block: bool = False) -> dict:
+    """Remove documentation-only keys from a schema.
+
+    If `multiline_to_block` is set, multiline strings are also converted
+    to YAML literal block scalars in the same pass, so that the result can be
+    serialized without another walk over the tree.
+    """
+    return _clean_schema(schema, is_prop_dict=is_prop_dict, multiline_to_block=multiline_to_block)
+
+
+def _clean_schema(
+    schema: dict | list,
+    is_prop_dict: bool,
+    multiline_to_block: bool,
+    cache: dict[tuple[int, bool], list] | None = None,
+) -> dict:
+    """Clean a schema, optionally sharing cleaned sub-schemas via `cache`.
+
+    Each cache entry holds the source node (so that its id is not reused),
+    its cleaned output, and whether that output is already part of another cleaned output.
+    A cached output is only reused as a whole, or adopted into a parent if it is not
+    part of any other output yet; sub-schemas that are shared in the source are copied instead.
+    This way, no output object appears twice in one tree, which would otherwise
+    be serialized as YAML anchors and aliases.
+    """
+    if not isinstance(schema, (dict, list)):
+        raise ValueError(f"Unsupported schema type: {type(schema)}")
+    if cache is not None:
+        entry = cache.get((id(schema), is_prop_dict))
+        if entry is not None:
+            return entry[1]
+    clean = {} if isinstance(schema, dict) else [None] * len(schema)
+    if cache is not None:
+        cache[(id(schema), is_prop_dict)] = [schema, clean, False]
+    # Each entry holds a source node, its (pre-allocated) cleaned container,
+    # whether the source node is a `properties` mapping, and whether to use the cache for its children.
+    stack: list[tuple[dict | list, dict | list, bool, bool]] = [(schema, clean, is_prop_dict, cache is not None)]
+    while stack:
+        node, out, node_is_prop_dict, use_cache = stack.pop()
+        for key, val in (node.items() if isinstance(node, dict) else enumerate(node)):
+            if not node_is_prop_dict and key in _CLEAN_BLACKLIST:
                 continue
             if isinstance(val, (dict, list)):
-                clean[key] = clean_schema(
-                    schema=val, is_prop_dict=isinstance(val, dict) and key == "properties"
-                )
-            else:
-                clean[key] = val
-    elif isinstance(schema, list):
-        clean = []
-        for item in schema:
-            if isinstance(item, (dict, list)):
-                clean.append(clean_schema(schema=item))
+                val_is_dict = isinstance(val, dict)
+                val_is_prop_dict = val_is_dict and key == "properties"
+                val_cache_key = (id(val), val_is_prop_dict)
+                entry = cache.get(val_cache_key) if use_cache else None
+                if entry is not None and not entry[2]:
+                    entry[2] = True
+                    out[key] = entry[1]
+                    continue
+                out[key] = sub_out = {} if val_is_dict else [None] * len(val)
+                sub_use_cache = use_cache and entry is None
+                if sub_use_cache:
+                    cache[val_cache_key] = [val, sub_out, True]
+                stack.append((val, sub_out, val_is_prop_dict, sub_use_cache))
+            elif multiline_to_block and isinstance(val, str) and "\n" in val:
+                out[key] = _yaml_scalar_string.preserve_literal(val)
             else:
-                clean.append(item)
-    else:
-        raise ValueError(f"Unsupported schema type: {type(schema)}")
+                out[key] = val
     return clean
 
 
+@_functools.lru_cache(maxsize=4096)
 def ref_name(ref: str) -> str:
     parts = ref.split("#")
     if len(parts) == 1:
@@ -93,14 +320,30 @@ def ref_name(ref: str) -> str:
     return parts[-1].split("/")[-1]
 
 
-def schema_to_md(schema: dict) -> str:
-    schema_text = _ps.write.to_yaml_string(data=clean_schema(schema=schema))
-    return _md.code_block(schema_text)
+def schema_to_yaml_filtered(schema: dict, clean_cache: dict | None = None) -> str:
+    """Serialize a schema to YAML, without its documentation-only keys.
+
+    Parameters
+    ----------
+    schema : dict
+        The schema to serialize.
+    clean_cache : dict, optional
+        A cache of cleaned schemas, to share between calls on the same schema
+        and its sub-schemas, e.g. during one documentation build.
+        Cleaned schemas are cached by identity, so the schemas must not be modified
+        (other than their documentation-only keys) while the cache is in use.
+    """
+    clean = _clean_schema(schema=schema, is_prop_dict=False, multiline_to_block=True, cache=clean_cache)
+    return _ps.write.to_yaml_string(data=clean, multiline_string_to_block=False)
+
+
+def schema_to_md(schema: dict, clean_cache: dict | None = None) -> str:
+    return _md.code_block(schema_to_yaml_filtered(schema, clean_cache=clean_cache))
 
 
 def default_to_md(schema: dict, key: str = "default", key_auto: str = "default_auto") -> tuple[str | None, bool]:
     if key in schema:
-        text = _ps.write.to_yaml_string(
+        text = _to_yaml_string(
             data=schema[key],
             end_of_file_newline=False
         ).removesuffix("\n...")
@@ -117,16 +360,21 @@ def examples_to_md(schema: dict, key: str = "examples") -> tuple[str | None, boo
         return None, False
     examples = schema[key]
     all_can_be_inline = True
+    total_len = 0
     examples_text = []
     for example in examples:
-        example_str = _ps.write.to_yaml_string(
+        example_str = _to_yaml_string(
             data=example,
             end_of_file_newline=False
         ).removesuffix("\n...")
         examples_text.append(example_str)
-        if not _text_can_be_inline(example_str):
+        if not all_can_be_inline:
+            continue
+        if _text_can_be_inline(example_str):
+            total_len += len(example_str)
+        else:
             all_can_be_inline = False
-    total_can_be_inline = sum((len(e) for e in examples_text)) <= INLINE_MAX_LINE_LENGTH
+    total_can_be_inline = total_len <= INLINE_MAX_LINE_LENGTH
     if all_can_be_inline and total_can_be_inline:
         return f"{_md.comma_list(examples_text, item_as_code=True, as_html=False)}", True
     if all_can_be_inline:
@@ -145,10 +393,8 @@ def not_to_md(
         return None, False
     _not = schema[key]
     if "$ref" in _not:
-        ref = _not["$ref"]
-        ref_tag = _miu.txt.slugf"{tag_prefix_refs}-{ref}")
-        return f"[`{ref_name(ref)}`](#{ref_tag})", True
-    tag = _miu.txt.slugf"{tag_prefix}-{fullpath}-not")
+        return _ref_link(_not["$ref"], tag_prefix_refs), True
+    tag = _slug(f"{tag_prefix}-{fullpath}-not")
     return f"[`not`](#{tag})", True
 
 
@@ -162,17 +408,17 @@ def some_of_to_md(
     if key not in schema:
         return None, False
     some_of = schema[key]
-    outputs = []
-    for i, subschema in enumerate(some_of):
-        idx = i + 1
+    num_subschemas = len(some_of)
+    outputs = [None] * num_subschemas
+    for i in range(num_subschemas):
+        subschema = some_of[i]
         if "$ref" in subschema:
-            ref = subschema["$ref"]
-            ref_tag = _miu.txt.slugf"{tag_prefix_refs}-{ref}")
-            outputs.append(f"[`{ref_name(ref)}`](#{ref_tag})")
+            outputs[i] = _ref_link(subschema["$ref"], tag_prefix_refs)
         else:
-            tag = _miu.txt.slugf"{tag_prefix}-{fullpath}-{key}-{idx}")
+            idx = i + 1
+            tag = _slug(f"{tag_prefix}-{fullpath}-{key}-{idx}")
             title = f"{key}[{idx}]"
-            outputs.append(f"[`{title}`](#{tag})")
+            outputs[i] = f"[`{title}`](#{tag})"
     return _md.comma_list(outputs, item_as_code=False, as_html=False), True
 
 
@@ -183,50 +429,68 @@ def if_to_md(
     tag_prefix_refs: str = "",
     key: str = "if",
 ) -> tuple[str | None, bool]:
-    output = []
-    for key in ("if", "then", "else"):
-        if key not in schema:
-            break
-        output.append(key)
-        sub = schema[key]
-        if "$ref" in sub:
-            ref = sub["$ref"]
-            ref_tag = _miu.txt.slugf"{tag_prefix_refs}-{ref}")
-            output.append(f"[`{ref_name(ref)}`](#{ref_tag})")
-            continue
-        tag = _miu.txt.slugf"{tag_prefix}-{fullpath}-{key}")
-        output.append(f"[`{key}`](#{tag})")
-    if not output:
+    if "if" not in schema:
         return None, False
+    output = ["if", _condition_link(schema, "if", fullpath, tag_prefix, tag_prefix_refs)]
+    if "then" in schema:
+        output += ["then", _condition_link(schema, "then", fullpath, tag_prefix, tag_prefix_refs)]
+        if "else" in schema:
+            output += ["else", _condition_link(schema, "else", fullpath, tag_prefix, tag_prefix_refs)]
     return " ".join(output), True
 
 
-def type_to_md(schema: dict, key: str = "type", tag_prefix_refs: str = "") -> tuple[str | None, bool]:
-    if "$ref" in schema:
-        ref = schema["$ref"]
-        ref_tag = _miu.txt.slugf"{tag_prefix_refs}-{ref}")
-        return f"[`{ref_name(ref)}`](#{ref_tag})", True
+def _condition_link(
+    schema: dict,
+    key: _Literal["if", "then", "else"],
+    fullpath: str,
+    tag_prefix: str,
+    tag_prefix_refs: str,
+) -> str:
+    sub = schema[key]
+    if "$ref" in sub:
+        return _ref_link(sub["$ref"], tag_prefix_refs)
+    tag = _slug(f"{tag_prefix}-{fullpath}-{key}")
+    return f"[`{key}`](#{tag})"
+
+
+def type_to_md(
+    schema: dict,
+    key: str = "type",
+    tag_prefix_refs: str = "",
+    mask: int | None = None,
+) -> tuple[str | None, bool]:
+    if mask is None:
+        mask = shape_mask(schema)
+    if mask & _REF_BIT:
+        return _ref_link(schema["$ref"], tag_prefix_refs), True
     dtype = schema.get(key)
     if isinstance(dtype, str):
-        return f"`{dtype}`", True
+        return _TYPE_MD.get(dtype) or f"`{dtype}`", True
     if isinstance(dtype, list):
         return " or ".join([f"`{v}`" for v in dtype]), True
     if dtype is None:
-        if any(key in schema for key in ["anyOf", "oneOf", "allOf", "not", "if"]):
+        if mask & _COMPLEX_MASK:
             return "`complex`", True
         else:
             return "`any`", True
     raise ValueError(f"Unsupported value for `type`: `{dtype}`")
 
 
-def additional_properties_to_md(schema: dict, key: str = "additionalProperties", tag_add_props: str | None = None) -> tuple[str | None, bool]:
+def additional_properties_to_md(
+    schema: dict,
+    key: str = "additionalProperties",
+    tag_add_props: str | None = None,
+    mask: int | None = None,
+) -> tuple[str | None, bool]:
     value = schema.get(key)
     if value is False:
         return "`false`", True
     if value is True:
         return "`any`", True
     if value is None:
-        if any(key in schema for key in ["$ref", "anyOf", "oneOf", "allOf", "not", "if"]):
+        if mask is None:
+            mask = shape_mask(schema)
+        if mask & _REF_COMPLEX_MASK:
             return None, False
         if schema.get("type") == "object":
             return "`any`", True
@@ -250,17 +514,103 @@ def scalar_to_md(schema: dict, key: str):
     if key not in schema:
         return None, False
     value = schema[key]
-    if isinstance(value, bool):
-        value = str(value).lower()
+    value_type = type(value)
+    if value_type is bool:
+        return _BOOL_MD[value], True
+    if value_type is int:
+        cached = _SMALL_INT_MD.get(value)
+        if cached is not None:
+            return cached, True
     return f"`{value}`", True
 
 
 def make_code_list(array: list) -> tuple[str, bool]:
-    array_text_len = sum((len(e) for e in array))
-    if array_text_len < INLINE_MAX_LINE_LENGTH:
+    # The total length must be strictly less than the maximum line length.
+    if _len_within(array, INLINE_MAX_LINE_LENGTH - 1):
         return _md.comma_list(array, item_as_code=True, as_html=False), True
     return _md.normal_list(items=array, item_as_code=True), False
 
 
+def _len_within(texts: list[str], max_len: int) -> bool:
+    """Check whether the total length of texts is at most `max_len`, stopping as soon as it is exceeded."""
+    total_len = 0
+    for text in texts:
+        total_len += len(text)
+        if total_len > max_len:
+            return False
+    return True
+
+
 def _text_can_be_inline(text: str) -> bool:
-    return "\n" not in text and len(str(text)) <= INLINE_MAX_LINE_LENGTH
+    return len(text) <= INLINE_MAX_LINE_LENGTH and "\n" not in text
+
+
+@_functools.lru_cache(maxsize=4096)
+def _ref_link(ref: str, tag_prefix_refs: str) -> str:
+    """Get the Markdown link to the documentation of a referenced schema."""
+    ref_tag = _slug(f"{tag_prefix_refs}-{ref}")
+    return f"[`{ref_name(ref)}`](#{ref_tag})"
+
+
+@_functools.lru_cache(maxsize=16384)
+def _slug(text: str) -> str:
+    return _miu.txt.slug(text)
+
+
+def _to_yaml_string(data: _Any, end_of_file_newline: bool = True, multiline_string_to_block: bool = True) -> str:
+    """Serialize data to YAML, reusing the output for data with identical content.
+
+    This is meant for small values that often repeat, like defaults and examples;
+    freezing a whole schema on each call would cost more than it saves.
+    """
+    try:
+        return _frozen_to_yaml_string(_freeze(data), end_of_file_newline, multiline_string_to_block)
+    except TypeError:
+        # Data contains values that cannot be used as cache key.
+        return _ps.write.to_yaml_string(
+            data=data,
+            end_of_file_newline=end_of_file_newline,
+            multiline_string_to_block=multiline_string_to_block,
+        )
+
+
+@_functools.lru_cache(maxsize=4096)
+def _frozen_to_yaml_string(frozen: tuple, end_of_file_newline: bool, multiline_string_to_block: bool) -> str:
+    return _ps.write.to_yaml_string(
+        data=_thaw(frozen),
+        end_of_file_newline=end_of_file_newline,
+        multiline_string_to_block=multiline_string_to_block,
+    )
+
+
+def _freeze(data: _Any) -> tuple:
+    """Convert data to a hashable form that is equal only for data with identical YAML output.
+
+    Mapping order is preserved, and each scalar is tagged with its type,
+    since e.g. `True`, `1` and `1.0` compare equal but are serialized differently.
+    Floats are stored by their hex representation, since e.g. `0.0` and `-0.0` also compare equal.
+    Only built-in types are supported; other types (e.g. round-trip containers and scalars
+    that carry comments or formatting information) raise a `TypeError`.
+    """
+    dtype = type(data)
+    if dtype is dict:
+        return dict, tuple((_freeze(key), _freeze(val)) for key, val in data.items())
+    if dtype is list:
+        return list, tuple(_freeze(item) for item in data)
+    if dtype is float:
+        return float, data.hex()
+    if dtype not in _FREEZABLE_SCALAR_TYPES:
+        raise TypeError(f"Unsupported type for freezing: {dtype}")
+    return dtype, data
+
+
+def _thaw(frozen: tuple) -> _Any:
+    """Reconstruct data from its frozen form; the inverse of `_freeze`."""
+    dtype, value = frozen
+    if dtype is dict:
+        return {_thaw(key): _thaw(val) for key, val in value}
+    if dtype is list:
+        return [_thaw(item) for item in value]
+    if dtype is float:
+        return float.fromhex(value)
+    return value
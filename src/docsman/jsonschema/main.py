@@ -9,7 +9,7 @@ import pyserials as _ps
 
 
 KEY_SETTING = {
-    "type": {"title": "Type", "processor": _schema.type_to_md, "dynamic_kwargs": ["tag_prefix_refs"]},
+    "type": {"title": "Type", "processor": _schema.type_to_md, "dynamic_kwargs": ["tag_prefix_refs", "mask"]},
     "const": {"title": "Const", "processor": _schema.scalar_to_md},
     "enum": {"title": "Enum", "processor": _schema.enum_to_md},
     "format": {"title": "Format", "processor": _schema.scalar_to_md},
@@ -26,7 +26,7 @@ KEY_SETTING = {
     "minItems": {"title": "Min Items", "processor": _schema.scalar_to_md},
     "maxProperties": {"title": "Max Properties", "processor": _schema.scalar_to_md},
     "minProperties": {"title": "Min Properties", "processor": _schema.scalar_to_md},
-    "additionalProperties": {"title": "Add. Properties", "processor": _schema.additional_properties_to_md, "dynamic_kwargs": ["tag_add_props"]},
+    "additionalProperties": {"title": "Add. Properties", "processor": _schema.additional_properties_to_md, "dynamic_kwargs": ["tag_add_props", "mask"]},
     "required": {"title": "Required Properties", "processor": _schema.required_to_md},
     "examples": {"title": "Examples", "processor": _schema.examples_to_md},
     "default": {"title": "Default", "processor": _schema.default_to_md, "kwargs": {"key_auto": "default_auto"}},
@@ -101,6 +101,8 @@ class SchemaDocGenerator:
         self._tag_prefix_refs: str = ""
         self._reference_map: dict[str, list[str]] = {}
         self._max_nesting: int = 0
+        self._index: _schema.SchemaIndex | None = None
+        self._clean_cache: dict = {}
         return
 
     def generate(
@@ -113,19 +115,25 @@ class SchemaDocGenerator:
         tag_prefix_refs: str = "ccs-ref",
         max_nesting: int = 3,
     ):
+        _schema.clear_caches()
         self._tag_prefix = tag_prefix
         self._tag_prefix_refs = tag_prefix_refs
         self._max_nesting = max_nesting
         self._path = _Path(filepath).resolve()
         self._schema: dict = _ps.read.from_file(path=self._path, yaml_safe=False)
-        output = self._generate_sections_recursive(
-            key=title or self._schema.get("root_key") or root_key or self._path.stem,
-            schema=self._schema,
-            level=1,
-            fullpath=self._schema.get("root_key") or root_key,
-            items_required=self._schema.get("schema_required") or required,
-            dont_show_fullpath=False,
-        )
+        self._index = _schema.SchemaIndex(self._schema)
+        self._clean_cache = {}
+        try:
+            output = self._generate_sections_recursive(
+                key=title or self._schema.get("root_key") or root_key or self._path.stem,
+                schema=self._schema,
+                level=1,
+                fullpath=self._schema.get("root_key") or root_key,
+                items_required=self._schema.get("schema_required") or required,
+                dont_show_fullpath=False,
+            )
+        finally:
+            self._clean_cache = {}
         return "\n".join(output), self._reference_map
 
     def _generate_sections_recursive(
@@ -153,7 +161,7 @@ class SchemaDocGenerator:
                 for subschema_key, subschema in zip(subschema_keys, subschemas):
                     if complex_key != "properties" and "$ref" in subschema:
                         continue
-                    if _schema.needs_separate_section(subschema, self._max_nesting):
+                    if self._index.needs_separate_section(subschema, self._max_nesting):
                         separate_schema[subschema_key] = (complex_key, subschema)
                     else:
                         subschema_text = self._generate_field_list_view(
@@ -259,6 +267,7 @@ class SchemaDocGenerator:
             "tag_prefix_refs": self._tag_prefix_refs,
             "fullpath": fullpath,
             "tag_prefix": self._tag_prefix,
+            "mask": _schema.shape_mask(schema),
         }
         sig = {}
         for key, setting in KEY_SETTING.items():
@@ -269,7 +278,7 @@ class SchemaDocGenerator:
             if value is None:
                 continue
             sig[key] = {"title": setting["title"], "value": value, "inline": inline_ok}
-        sig["schema"] = {"title": "Schema", "value": _schema.schema_to_md(schema), "inline": False}
+        sig["schema"] = {"title": "Schema", "value": _schema.schema_to_md(schema, clean_cache=self._clean_cache), "inline": False}
         return sig
 
     def make_tag(self, fullpath: str) -> str:
@@ -6,6 +6,8 @@ import jsonschemata as _jsonschemata
 import pkgdata as _pkgdata
 import pyserials as _ps
 
+from docsman import _file_util
+
 
 def load(
     dynamic: bool = False,
@@ -18,7 +20,9 @@ def load(
     resources = add_resources or []
     schema_dir_path = _pkgdata.get_package_path_from_caller(top_level=True) / "_data" / "schema"
     for schema_filepath in schema_dir_path.glob("**/*.yaml"):
-        schema_dict = _ps.read.yaml_from_file(path=schema_filepath)
+        schema_dict = _file_util.get_package_datafile_yaml(
+            f"schema/{schema_filepath.relative_to(schema_dir_path).as_posix()}"
+        )
         _jsonschemata.edit.required_last(schema_dict)
         resources.append(schema_dict)
         schema_path = schema_dict["$id"].removeprefix("https://docsman.repodynamics.com/schema/")